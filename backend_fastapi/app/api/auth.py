@@ -158,8 +158,10 @@ async def login(request: Request, user_data: UserLogin, db: Session = Depends(ge
 @router.post("/guest", response_model=GuestResponse)
 @limiter.limit("10/minute")
 async def guest_login(request: Request, db: Session = Depends(get_db)):
-    guest_email = f"guest_{int(uuid.uuid4().time)}_{secrets.token_hex(3)}@guest.local"
-    user_id = str(uuid.uuid4())
+    # Email derives from the same UUID as the id, so it is unique by construction
+    guest_uuid = uuid.uuid4()
+    user_id = str(guest_uuid)
+    guest_email = f"guest_{guest_uuid.hex}@guest.local"
 
     # Create User (authentication)
     user = User(
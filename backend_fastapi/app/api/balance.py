@@ -3,7 +3,6 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import OperationalError
 from app.db.base import get_db
 from app.models.user import User
-from app.models.user_balance import UserBalance
 from app.models.transaction import Transaction, TransactionType, TransactionStatus
 from app.schemas.balance import BalanceResponse, BalanceAdd
 from app.api.auth import get_current_user
@@ -46,10 +45,8 @@ async def add_balance(
             detail="Amount must be positive"
         )
 
-    # Get UserBalance entity
-    user_balance = db.query(UserBalance).filter(
-        UserBalance.user_id == current_user.id
-    ).first()
+    # Get UserBalance entity (loaded with current_user)
+    user_balance = current_user.balance_info
 
     if not user_balance:
         raise HTTPException(
@@ -68,11 +65,12 @@ async def add_balance(
 
     # Modify UserBalance, not User
     user_balance.balance += balance_data.amount
+    # Read before commit expires the row
+    new_balance = user_balance.balance
 
     db.add(transaction)
     try:
         db.commit()
-        db.refresh(user_balance)
     except OperationalError as e:
         db.rollback()
         raise DatabaseError(f"Database connection error: {str(e)}")
@@ -81,7 +79,7 @@ async def add_balance(
         raise DatabaseError(f"Failed to add balance: {str(e)}")
 
     return {
-        "balance": float(user_balance.balance),
+        "balance": float(new_balance),
         "message": "Balance added successfully"
     }
 
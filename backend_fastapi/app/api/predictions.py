@@ -3,7 +3,6 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, OperationalError
 from app.db.base import get_db
 from app.models.user import User
-from app.models.user_balance import UserBalance
 from app.models.prediction import Prediction, PredictionStatus
 from app.schemas.prediction import PredictionCreate, PredictionResponse
 from app.api.auth import get_current_user
@@ -29,10 +28,8 @@ async def create_prediction(
     """
     cost = settings.ML_SERVICE_COST_PER_REQUEST
 
-    # Get UserBalance entity
-    user_balance = db.query(UserBalance).filter(
-        UserBalance.user_id == current_user.id
-    ).first()
+    # Get UserBalance entity (loaded with current_user)
+    user_balance = current_user.balance_info
 
     if not user_balance:
         raise HTTPException(
@@ -46,8 +43,9 @@ async def create_prediction(
             f"Insufficient balance. Required: {cost}, Available: {user_balance.balance}"
         )
 
+    prediction_id = str(uuid.uuid4())
     prediction = Prediction(
-        id=str(uuid.uuid4()),
+        id=prediction_id,
         user_id=current_user.id,
         model_id="mistral",
         input_data={"message": prediction_data.message, "history": prediction_data.conversation_history},
@@ -57,12 +55,11 @@ async def create_prediction(
 
     # Deduct from UserBalance, not User
     user_balance.balance -= cost
+    remaining_balance = user_balance.balance
 
     db.add(prediction)
     try:
         db.commit()
-        db.refresh(prediction)
-        db.refresh(user_balance)
     except IntegrityError as e:
         db.rollback()
         raise DatabaseError(f"Failed to create prediction: {str(e)}")
@@ -74,8 +71,8 @@ async def create_prediction(
         raise DatabaseError(f"Unexpected error: {str(e)}")
 
     return {
-        "predictionId": prediction.id,
-        "remainingBalance": float(user_balance.balance),
+        "predictionId": prediction_id,
+        "remainingBalance": float(remaining_balance),
         "message": "Prediction request submitted"
     }
 
@@ -86,12 +83,11 @@ async def get_prediction(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    prediction = db.query(Prediction).filter(
-        Prediction.id == prediction_id,
-        Prediction.user_id == current_user.id
-    ).first()
+    # PK lookup goes through Session.get's cached statement; ownership is
+    # checked in Python and reported as 404 so other users' ids don't leak
+    prediction = db.get(Prediction, prediction_id)
 
-    if not prediction:
+    if not prediction or prediction.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Prediction not found"
@@ -24,6 +24,7 @@ from dataclasses import dataclass
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.db.base import engine, SessionLocal, Base
@@ -355,43 +356,43 @@ class TransactionSeeder(BaseSeeder):
             self._log_skipped("No user ID provided for transactions")
             return []
 
-        for tx_data in self.get_seed_data():
-            tx_id = self._create_transaction(tx_data)
-            if tx_id:
-                self._created_items.append(tx_id)
+        rows = [self._build_row(tx_data) for tx_data in self.get_seed_data()]
+        tx_ids = [row["id"] for row in rows]
 
-        if self._created_items:
-            self._log_created(f"Created {len(self._created_items)} demo transactions")
+        # Core INSERT с executemany: один запрос и один commit на весь набор,
+        # без unit-of-work ORM для каждой строки
+        try:
+            self.db.execute(insert(Transaction), rows)
+            self.db.commit()
+
+        except IntegrityError:
+            self.db.rollback()
+            self._log_error("Failed to create demo transactions")
+            return []
+
+        self._created_items.extend(tx_ids)
+        self._log_created(f"Created {len(self._created_items)} demo transactions")
 
         return self.created_items
 
-    def _create_transaction(self, data: TransactionSeedData) -> Optional[str]:
+    def _build_row(self, data: TransactionSeedData) -> Dict[str, Any]:
         """
-        Create a single transaction.
+        Build column values for a single transaction.
 
         Args:
             data: Transaction seed data
 
         Returns:
-            Transaction ID if created, None if failed
+            Mapping of Transaction column names to values
         """
-        transaction = Transaction(
-            id=str(uuid.uuid4()),
-            user_id=self._user_id,
-            type=data.type,
-            amount=data.amount,
-            status=data.status,
-            description=data.description
-        )
-
-        try:
-            self.db.add(transaction)
-            self.db.commit()
-            return transaction.id
-
-        except IntegrityError:
-            self.db.rollback()
-            return None
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": self._user_id,
+            "type": data.type,
+            "amount": data.amount,
+            "status": data.status,
+            "description": data.description,
+        }
 
 
 # ============================================================
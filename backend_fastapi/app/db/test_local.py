@@ -19,13 +19,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 import uuid
 
 
-# Create SQLite in-memory database for testing
+# Create SQLite in-memory database for testing.
+# StaticPool pins the single connection explicitly instead of relying on
+# the per-thread default pool.
 TEST_DATABASE_URL = "sqlite:///:memory:"
-test_engine = create_engine(TEST_DATABASE_URL, echo=False)
-TestSession = sessionmaker(bind=test_engine)
+test_engine = create_engine(TEST_DATABASE_URL, echo=False, poolclass=StaticPool)
+TestSession = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
 
 def run_local_tests():
@@ -67,10 +70,15 @@ def run_local_tests():
             role=UserRole.USER,
             is_active=True
         )
-        db.add(user)
+        user_balance = UserBalance(
+            user_id=user_id,
+            balance=Decimal("1000.00")
+        )
+        # User и UserBalance сохраняются одним commit
+        db.add_all([user, user_balance])
         db.commit()
 
-        saved_user = db.query(User).filter(User.id == user_id).first()
+        saved_user = db.get(User, user_id)
         if saved_user and saved_user.email == "test@example.com":
             print("  ✓ User creation: PASSED")
             passed += 1
@@ -81,14 +89,7 @@ def run_local_tests():
         # ============================================================
         # TEST 2: Create UserBalance (SRP)
         # ============================================================
-        user_balance = UserBalance(
-            user_id=user_id,
-            balance=Decimal("1000.00")
-        )
-        db.add(user_balance)
-        db.commit()
-
-        saved_balance = db.query(UserBalance).filter(UserBalance.user_id == user_id).first()
+        saved_balance = db.get(UserBalance, user_id)
         if saved_balance and saved_balance.balance == Decimal("1000.00"):
             print("  ✓ UserBalance creation (SRP): PASSED")
             passed += 1
@@ -120,7 +121,7 @@ def run_local_tests():
         db.add(admin)
         db.commit()
 
-        saved_admin = db.query(User).filter(User.id == admin_id).first()
+        saved_admin = db.get(User, admin_id)
         if saved_admin and saved_admin.role == UserRole.ADMIN:
             print("  ✓ Admin role assignment: PASSED")
             passed += 1
@@ -188,7 +189,7 @@ def run_local_tests():
         db.add(tx1)
         db.commit()
 
-        saved_tx = db.query(Transaction).filter(Transaction.id == tx1.id).first()
+        saved_tx = db.get(Transaction, tx1.id)
         if saved_tx and saved_tx.type == TransactionType.DEPOSIT:
             print("  ✓ Create deposit transaction: PASSED")
             passed += 1
@@ -210,7 +211,7 @@ def run_local_tests():
         db.add(tx2)
         db.commit()
 
-        saved_tx2 = db.query(Transaction).filter(Transaction.id == tx2.id).first()
+        saved_tx2 = db.get(Transaction, tx2.id)
         if saved_tx2 and saved_tx2.type == TransactionType.WITHDRAW:
             print("  ✓ Create withdrawal transaction: PASSED")
             passed += 1
@@ -241,13 +242,15 @@ def run_local_tests():
             id="test-model",
             name="Test Predictor",
             description="Test ML model",
-            endpoint_url="http://localhost:8000/predict",
-            is_active=True
+            type="prediction",
+            cost_per_request=Decimal("10.00"),
+            endpoint="http://localhost:8000/predict",
+            status="active"
         )
         db.add(ml_model)
         db.commit()
 
-        saved_model = db.query(MLModel).filter(MLModel.id == "test-model").first()
+        saved_model = db.get(MLModel, "test-model")
         if saved_model and saved_model.name == "Test Predictor":
             print("  ✓ Create ML model: PASSED")
             passed += 1
@@ -258,7 +261,7 @@ def run_local_tests():
         # ============================================================
         # TEST 12: Deactivate ML Model
         # ============================================================
-        saved_model.is_active = False
+        saved_model.status = "inactive"
         db.commit()
         db.refresh(saved_model)
 
@@ -27,6 +27,7 @@ from enum import Enum
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from sqlalchemy.engine import Connection, RootTransaction
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.db.base import engine, SessionLocal, Base
@@ -36,9 +37,15 @@ from app.models.transaction import Transaction, TransactionType, TransactionStat
 from app.models.prediction import Prediction, PredictionStatus
 from app.models.ml_model import MLModel
 from app.core.security import get_password_hash, verify_password
+from app.core.user_helpers import get_user_with_balance
 import uuid
 
 
+# bcrypt намеренно медленный; тестовым пользователям нужен только
+# валидный password_hash, поэтому считаем его один раз на весь прогон.
+_TEST_PASSWORD_HASH = get_password_hash("testpass123")
+
+
 # ============================================================
 # Test Result Types
 # ============================================================
@@ -118,6 +125,38 @@ class BaseTest(ABC):
         """Record a skipped test."""
         self._add_result(name, TestStatus.SKIPPED, message)
 
+    def _create_test_user(self, email_prefix: str, balance: Decimal) -> Optional[str]:
+        """
+        Create a test user together with its balance in one commit.
+
+        Args:
+            email_prefix: Prefix for the generated email
+            balance: Initial balance
+
+        Returns:
+            User ID if created, None if setup failed
+        """
+        user_id = str(uuid.uuid4())
+
+        try:
+            self.db.add_all([
+                User(
+                    id=user_id,
+                    email=f"{email_prefix}_{user_id[:8]}@test.com",
+                    password_hash=_TEST_PASSWORD_HASH,
+                    role=UserRole.USER,
+                    is_active=True
+                ),
+                UserBalance(user_id=user_id, balance=balance)
+            ])
+            self.db.commit()
+            return user_id
+
+        except Exception as e:
+            self.db.rollback()
+            self._failed("setup", f"Failed to create test user: {str(e)}")
+            return None
+
 
 # ============================================================
 # User Tests (SRP)
@@ -151,7 +190,7 @@ class UserTest(BaseTest):
             user = User(
                 id=user_id,
                 email=test_email,
-                password_hash=get_password_hash("testpass123"),
+                password_hash=_TEST_PASSWORD_HASH,
                 role=UserRole.USER,
                 is_active=True
             )
@@ -159,16 +198,12 @@ class UserTest(BaseTest):
             self.db.commit()
 
             # Verify
-            saved_user = self.db.query(User).filter(User.id == user_id).first()
+            saved_user = self.db.get(User, user_id)
             if saved_user and saved_user.email == test_email:
                 self._passed("create_user", f"User created successfully: {test_email}")
             else:
                 self._failed("create_user", "User not found after creation")
 
-            # Cleanup
-            self.db.delete(saved_user)
-            self.db.commit()
-
         except Exception as e:
             self.db.rollback()
             self._failed("create_user", f"Failed to create user: {str(e)}")
@@ -182,7 +217,7 @@ class UserTest(BaseTest):
             user = User(
                 id=user_id,
                 email=test_email,
-                password_hash=get_password_hash("testpass123"),
+                password_hash=_TEST_PASSWORD_HASH,
                 role=UserRole.USER,
                 is_active=True
             )
@@ -196,8 +231,8 @@ class UserTest(BaseTest):
             self.db.add(user_balance)
             self.db.commit()
 
-            # Verify user with balance relationship
-            saved_user = self.db.query(User).filter(User.id == user_id).first()
+            # Verify user with balance relationship (one JOIN query, no lazy load)
+            saved_user = get_user_with_balance(self.db, user_id)
             if saved_user and saved_user.balance_info:
                 balance = saved_user.balance_info.balance
                 if balance == Decimal("1000.00"):
@@ -209,10 +244,6 @@ class UserTest(BaseTest):
             else:
                 self._failed("create_user_with_balance", "User or balance not found")
 
-            # Cleanup
-            self.db.delete(saved_user)
-            self.db.commit()
-
         except Exception as e:
             self.db.rollback()
             self._failed("create_user_with_balance", f"Failed: {str(e)}")
@@ -242,22 +273,19 @@ class UserTest(BaseTest):
             admin = User(
                 id=user_id,
                 email=test_email,
-                password_hash=get_password_hash("adminpass"),
+                password_hash=_TEST_PASSWORD_HASH,
                 role=UserRole.ADMIN,
                 is_active=True
             )
             self.db.add(admin)
             self.db.commit()
 
-            saved_admin = self.db.query(User).filter(User.id == user_id).first()
+            saved_admin = self.db.get(User, user_id)
             if saved_admin and saved_admin.role == UserRole.ADMIN:
                 self._passed("user_roles", f"Admin role assigned correctly: {test_email}")
             else:
                 self._failed("user_roles", "Role not assigned correctly")
 
-            self.db.delete(saved_admin)
-            self.db.commit()
-
         except Exception as e:
             self.db.rollback()
             self._failed("user_roles", f"Failed: {str(e)}")
@@ -272,7 +300,7 @@ class UserTest(BaseTest):
             user1 = User(
                 id=user_id1,
                 email=test_email,
-                password_hash=get_password_hash("pass1"),
+                password_hash=_TEST_PASSWORD_HASH,
                 role=UserRole.USER,
                 is_active=True
             )
@@ -283,7 +311,7 @@ class UserTest(BaseTest):
             user2 = User(
                 id=user_id2,
                 email=test_email,  # Same email
-                password_hash=get_password_hash("pass2"),
+                password_hash=_TEST_PASSWORD_HASH,
                 role=UserRole.USER,
                 is_active=True
             )
@@ -296,12 +324,6 @@ class UserTest(BaseTest):
                 self.db.rollback()
                 self._passed("duplicate_email", "Duplicate email correctly rejected")
 
-            # Cleanup
-            user1 = self.db.query(User).filter(User.id == user_id1).first()
-            if user1:
-                self.db.delete(user1)
-                self.db.commit()
-
         except Exception as e:
             self.db.rollback()
             self._failed("duplicate_email", f"Unexpected error: {str(e)}")
@@ -323,55 +345,17 @@ class BalanceTest(BaseTest):
 
     def run(self) -> List[TestResult]:
         """Run all balance tests."""
-        user_id = self._create_test_user()
+        user_id = self._create_test_user("test_bal", Decimal("100.00"))
         if user_id:
             self._test_add_balance(user_id)
             self._test_deduct_balance(user_id)
             self._test_insufficient_balance(user_id)
-            self._cleanup_test_user(user_id)
         return self.results
 
-    def _create_test_user(self) -> Optional[str]:
-        """Create a test user for balance tests."""
-        user_id = str(uuid.uuid4())
-        test_email = f"test_bal_{user_id[:8]}@test.com"
-
-        try:
-            user = User(
-                id=user_id,
-                email=test_email,
-                password_hash=get_password_hash("testpass"),
-                role=UserRole.USER,
-                is_active=True
-            )
-            user_balance = UserBalance(user_id=user_id, balance=Decimal("100.00"))
-
-            self.db.add(user)
-            self.db.add(user_balance)
-            self.db.commit()
-            return user_id
-
-        except Exception as e:
-            self.db.rollback()
-            self._failed("setup", f"Failed to create test user: {str(e)}")
-            return None
-
-    def _cleanup_test_user(self, user_id: str) -> None:
-        """Clean up test user."""
-        try:
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if user:
-                self.db.delete(user)
-                self.db.commit()
-        except Exception:
-            self.db.rollback()
-
     def _test_add_balance(self, user_id: str) -> None:
         """Test adding balance."""
         try:
-            user_balance = self.db.query(UserBalance).filter(
-                UserBalance.user_id == user_id
-            ).first()
+            user_balance = self.db.get(UserBalance, user_id)
 
             initial_balance = user_balance.balance
             add_amount = Decimal("50.00")
@@ -395,9 +379,7 @@ class BalanceTest(BaseTest):
     def _test_deduct_balance(self, user_id: str) -> None:
         """Test deducting balance."""
         try:
-            user_balance = self.db.query(UserBalance).filter(
-                UserBalance.user_id == user_id
-            ).first()
+            user_balance = self.db.get(UserBalance, user_id)
 
             initial_balance = user_balance.balance
             deduct_amount = Decimal("30.00")
@@ -421,9 +403,7 @@ class BalanceTest(BaseTest):
     def _test_insufficient_balance(self, user_id: str) -> None:
         """Test insufficient balance check."""
         try:
-            user_balance = self.db.query(UserBalance).filter(
-                UserBalance.user_id == user_id
-            ).first()
+            user_balance = self.db.get(UserBalance, user_id)
 
             current_balance = user_balance.balance
             large_amount = Decimal("10000.00")
@@ -455,57 +435,19 @@ class TransactionTest(BaseTest):
 
     def run(self) -> List[TestResult]:
         """Run all transaction tests."""
-        user_id = self._create_test_user()
+        user_id = self._create_test_user("test_tx", Decimal("500.00"))
         if user_id:
             self._test_create_deposit(user_id)
             self._test_create_withdrawal(user_id)
             self._test_transaction_history(user_id)
-            self._cleanup_test_user(user_id)
         return self.results
 
-    def _create_test_user(self) -> Optional[str]:
-        """Create a test user for transaction tests."""
-        user_id = str(uuid.uuid4())
-        test_email = f"test_tx_{user_id[:8]}@test.com"
-
-        try:
-            user = User(
-                id=user_id,
-                email=test_email,
-                password_hash=get_password_hash("testpass"),
-                role=UserRole.USER,
-                is_active=True
-            )
-            user_balance = UserBalance(user_id=user_id, balance=Decimal("500.00"))
-
-            self.db.add(user)
-            self.db.add(user_balance)
-            self.db.commit()
-            return user_id
-
-        except Exception as e:
-            self.db.rollback()
-            self._failed("setup", f"Failed to create test user: {str(e)}")
-            return None
-
-    def _cleanup_test_user(self, user_id: str) -> None:
-        """Clean up test user and their transactions."""
-        try:
-            # Delete transactions first
-            self.db.query(Transaction).filter(Transaction.user_id == user_id).delete()
-            # Delete user (cascades to balance)
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if user:
-                self.db.delete(user)
-            self.db.commit()
-        except Exception:
-            self.db.rollback()
-
     def _test_create_deposit(self, user_id: str) -> None:
         """Test creating a deposit transaction."""
         try:
+            tx_id = str(uuid.uuid4())
             tx = Transaction(
-                id=str(uuid.uuid4()),
+                id=tx_id,
                 user_id=user_id,
                 type=TransactionType.DEPOSIT,
                 amount=Decimal("100.00"),
@@ -515,7 +457,7 @@ class TransactionTest(BaseTest):
             self.db.add(tx)
             self.db.commit()
 
-            saved_tx = self.db.query(Transaction).filter(Transaction.id == tx.id).first()
+            saved_tx = self.db.get(Transaction, tx_id)
             if saved_tx and saved_tx.type == TransactionType.DEPOSIT:
                 self._passed("create_deposit",
                             f"Deposit transaction created: {saved_tx.amount}")
@@ -529,8 +471,9 @@ class TransactionTest(BaseTest):
     def _test_create_withdrawal(self, user_id: str) -> None:
         """Test creating a withdrawal transaction."""
         try:
+            tx_id = str(uuid.uuid4())
             tx = Transaction(
-                id=str(uuid.uuid4()),
+                id=tx_id,
                 user_id=user_id,
                 type=TransactionType.WITHDRAW,
                 amount=Decimal("50.00"),
@@ -540,7 +483,7 @@ class TransactionTest(BaseTest):
             self.db.add(tx)
             self.db.commit()
 
-            saved_tx = self.db.query(Transaction).filter(Transaction.id == tx.id).first()
+            saved_tx = self.db.get(Transaction, tx_id)
             if saved_tx and saved_tx.type == TransactionType.WITHDRAW:
                 self._passed("create_withdrawal",
                             f"Withdrawal transaction created: {saved_tx.amount}")
@@ -607,16 +550,12 @@ class MLModelTest(BaseTest):
             self.db.add(model)
             self.db.commit()
 
-            saved_model = self.db.query(MLModel).filter(MLModel.id == model_id).first()
+            saved_model = self.db.get(MLModel, model_id)
             if saved_model and saved_model.name == "Test Model":
                 self._passed("create_model", f"ML Model created: {model_id}")
             else:
                 self._failed("create_model", "Model not saved correctly")
 
-            # Cleanup
-            self.db.delete(saved_model)
-            self.db.commit()
-
         except Exception as e:
             self.db.rollback()
             self._failed("create_model", f"Failed: {str(e)}")
@@ -649,10 +588,6 @@ class MLModelTest(BaseTest):
             else:
                 self._failed("model_activation", "Model deactivation failed")
 
-            # Cleanup
-            self.db.delete(model)
-            self.db.commit()
-
         except Exception as e:
             self.db.rollback()
             self._failed("model_activation", f"Failed: {str(e)}")
@@ -673,6 +608,8 @@ class TestRunner:
 
     def __init__(self):
         self._db: Optional[Session] = None
+        self._connection: Optional[Connection] = None
+        self._transaction: Optional[RootTransaction] = None
         self._all_results: List[Tuple[str, List[TestResult]]] = []
 
     def run_all(self) -> Tuple[int, int, int]:
@@ -684,7 +621,7 @@ class TestRunner:
         """
         self._print_header()
         self._create_tables()
-        self._db = SessionLocal()
+        self._open_session()
 
         try:
             # Run all test suites
@@ -700,12 +637,33 @@ class TestRunner:
             return self._print_summary()
 
         finally:
-            self._db.close()
+            self._close_session()
 
     def _create_tables(self) -> None:
         """Ensure tables exist."""
         Base.metadata.create_all(bind=engine)
 
+    def _open_session(self) -> None:
+        """
+        Open a session inside an outer transaction.
+
+        commit()/rollback() в тестах работают с SAVEPOINT, а внешняя
+        транзакция откатывается в _close_session(), поэтому тестовые
+        данные не остаются в базе.
+        """
+        self._connection = engine.connect()
+        self._transaction = self._connection.begin()
+        self._db = SessionLocal(
+            bind=self._connection,
+            join_transaction_mode="create_savepoint"
+        )
+
+    def _close_session(self) -> None:
+        """Close the session and roll back everything the tests wrote."""
+        self._db.close()
+        self._transaction.rollback()
+        self._connection.close()
+
     def _print_header(self) -> None:
         """Print test header."""
         print("\n" + "=" * 60)
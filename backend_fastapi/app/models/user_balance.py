@@ -1,7 +1,12 @@
 from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-from datetime import datetime
-from app.models.user import Base
+from datetime import datetime, timezone
+from app.db.base import Base
+
+
+def _utcnow() -> datetime:
+    """Текущее время в UTC без tzinfo (колонки TIMESTAMP без часового пояса)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class UserBalance(Base):
@@ -37,14 +42,14 @@ class UserBalance(Base):
     created_at = Column(
         DateTime,
         nullable=False,
-        default=datetime.utcnow
+        default=_utcnow
     )
 
     updated_at = Column(
         DateTime,
         nullable=False,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow
+        default=_utcnow,
+        onupdate=_utcnow
     )
 
     # Relationship с User (обратная связь)
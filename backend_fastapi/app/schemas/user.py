@@ -5,6 +5,10 @@ from typing import Optional
 import re
 
 
+_LETTER_RE = re.compile(r'[A-Za-z]')
+_DIGIT_RE = re.compile(r'\d')
+
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -14,9 +18,9 @@ class UserCreate(BaseModel):
     def validate_password(cls, v: str) -> str:
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        if not re.search(r'[A-Za-z]', v):
+        if not _LETTER_RE.search(v):
             raise ValueError('Password must contain at least one letter')
-        if not re.search(r'\d', v):
+        if not _DIGIT_RE.search(v):
             raise ValueError('Password must contain at least one digit')
         return v
 
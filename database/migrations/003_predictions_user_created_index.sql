@@ -0,0 +1,34 @@
+-- ===================================================
+-- Migration: Composite index for prediction history
+-- Date: 2026-10-16
+-- Description: Индекс predictions(user_id, created_at DESC) для выборки
+--              последних предсказаний пользователя
+-- ===================================================
+
+-- Шаг 1: Создаем составной индекс
+-- Запрос "последние N предсказаний пользователя"
+--   WHERE user_id = ? ORDER BY created_at DESC LIMIT N
+-- обслуживается одним проходом по индексу, без сортировки.
+CREATE INDEX IF NOT EXISTS idx_predictions_user_created
+    ON predictions(user_id, created_at DESC);
+
+-- Шаг 2: Обновляем статистику
+ANALYZE predictions;
+
+-- ===================================================
+-- Объяснение:
+-- ===================================================
+--
+-- Было:
+--   idx_predictions_user_id    (user_id)
+--   idx_predictions_created_at (created_at DESC)
+--   → Index Scan по user_id + Sort по created_at
+--
+-- Стало:
+--   idx_predictions_user_created (user_id, created_at DESC)
+--   → Index Scan в нужном порядке, Sort не нужен
+--
+-- Одиночный индекс по user_id не удаляем: составной индекс покрывает
+-- его как префикс, но удаление лучше делать отдельной миграцией после
+-- проверки планов запросов.
+-- ===================================================